@@ -10,6 +10,7 @@ from airflow.providers.google.cloud.operators.bigquery import (
     BigQueryInsertJobOperator
 )
 from airflow.providers.google.cloud.operators.gcs import GCSFileTransformOperator
+from airflow.providers.google.cloud.transfers.bigquery_to_bigquery import BigQueryToBigQueryOperator
 from airflow.operators.bash import BashOperator
 from airflow.operators.python import PythonOperator
 from airflow.sensors.filesystem import FileSensor
@@ -46,103 +47,94 @@ DATASET_STAGING = 'staging'
 DATASET_CURATED = 'curated'
 DATASET_MART = 'mart'
 
+# dbt keeps its target directory (manifest.json, partial_parse.msgpack) on the
+# persistent dbt_state volume, so each dbt task only re-parses files that changed
+# since the previous task or run. Only one dbt task runs at a time, and
+# max_active_runs=1 keeps runs from sharing it. Dev runs can reuse the prod
+# manifest with: dbt build --defer --state /opt/airflow/dbt_state/target
+DBT_STATE_DIR = '/opt/airflow/dbt_state'
+DBT_ENV = {
+    'DBT_PARTIAL_PARSE': 'true',
+    'DBT_TARGET_PATH': f'{DBT_STATE_DIR}/target',
+}
+
 # Task 1: Check for new data files
+# Reschedule mode releases the worker slot between pokes instead of holding it
+# for the whole timeout
 check_new_data = FileSensor(
     task_id='check_new_data',
     filepath='/tmp/data/events/',
     fs_conn_id='fs_default',
     poke_interval=60,
     timeout=300,
+    mode='reschedule',
     dag=dag
 )
 
 # Task 2: Load raw data to BigQuery (if using batch ingestion)
-load_raw_events = BigQueryInsertJobOperator(
+# Copies the run's partition ({{ ds_nodash }}, i.e. yesterday) with a copy job
+# instead of INSERT ... SELECT *: copies are metadata operations that don't
+# consume slots or bill scanned bytes. Both tables must share the same schema
+# and daily partitioning. WRITE_TRUNCATE on the partition decorator replaces
+# only that partition, so a retry after a successful copy can't duplicate it.
+load_raw_events = BigQueryToBigQueryOperator(
     task_id='load_raw_events',
-    configuration={
-        "query": {
-            "query": f"""
-                INSERT INTO `{PROJECT_ID}.{DATASET_RAW}.events`
-                SELECT * FROM `{PROJECT_ID}.{DATASET_RAW}.events_staging`
-                WHERE event_date = CURRENT_DATE() - 1
-            """,
-            "useLegacySql": False,
-        }
-    },
-    dag=dag
-)
-
-# Task 3: Run dbt staging models
-dbt_staging = BashOperator(
-    task_id='dbt_staging',
-    bash_command=f"""
-        cd /opt/airflow/dbt_project
-        dbt run --models staging --target prod
-    """,
-    dag=dag
-)
-
-# Task 4: Run dbt tests for staging
-dbt_test_staging = BashOperator(
-    task_id='dbt_test_staging',
-    bash_command=f"""
-        cd /opt/airflow/dbt_project
-        dbt test --models staging --target prod
-    """,
-    dag=dag
-)
-
-# Task 5: Run dbt curated models
-dbt_curated = BashOperator(
-    task_id='dbt_curated',
-    bash_command=f"""
-        cd /opt/airflow/dbt_project
-        dbt run --models curated --target prod
-    """,
+    source_project_dataset_tables=f"{PROJECT_ID}.{DATASET_RAW}.events_staging${{{{ ds_nodash }}}}",
+    destination_project_dataset_table=f"{PROJECT_ID}.{DATASET_RAW}.events${{{{ ds_nodash }}}}",
+    write_disposition='WRITE_TRUNCATE',
+    create_disposition='CREATE_NEVER',
     dag=dag
 )
 
-# Task 6: Run dbt tests for curated
-dbt_test_curated = BashOperator(
-    task_id='dbt_test_curated',
+# Task 3: Build (run + test) dbt staging models
+dbt_build_staging = BashOperator(
+    task_id='dbt_build_staging',
     bash_command=f"""
         cd /opt/airflow/dbt_project
-        dbt test --models curated --target prod
+        dbt build --select staging --target prod
     """,
+    env=DBT_ENV,
+    append_env=True,
     dag=dag
 )
 
-# Task 7: Run dbt mart models
-dbt_mart = BashOperator(
-    task_id='dbt_mart',
+# Task 4: Build (run + test) dbt curated models
+dbt_build_curated = BashOperator(
+    task_id='dbt_build_curated',
     bash_command=f"""
         cd /opt/airflow/dbt_project
-        dbt run --models mart --target prod
+        dbt build --select curated --target prod
     """,
+    env=DBT_ENV,
+    append_env=True,
     dag=dag
 )
 
-# Task 8: Run dbt tests for mart
-dbt_test_mart = BashOperator(
-    task_id='dbt_test_mart',
+# Task 5: Build (run + test) dbt mart models
+dbt_build_mart = BashOperator(
+    task_id='dbt_build_mart',
     bash_command=f"""
         cd /opt/airflow/dbt_project
-        dbt test --models mart --target prod
+        dbt build --select mart --target prod
     """,
+    env=DBT_ENV,
+    append_env=True,
     dag=dag
 )
 
-# Task 9: Generate dbt documentation
+# Task 6: Generate dbt documentation
 dbt_docs = BashOperator(
     task_id='dbt_docs',
     bash_command=f"""
         cd /opt/airflow/dbt_project
         dbt docs generate --target prod
     """,
+    env=DBT_ENV,
+    append_env=True,
     dag=dag
 )
 
-# Task 10: Data quality validation
+# Task 7: Data quality validation
 data_quality_check = BigQueryInsertJobOperator(
     task_id='data_quality_check',
     configuration={
@@ -175,14 +167,14 @@ data_quality_check = BigQueryInsertJobOperator(
     dag=dag
 )
 
-# Task 11: Send success notification
+# Task 8: Send success notification
 send_success_notification = BashOperator(
     task_id='send_success_notification',
     bash_command='echo "Data pipeline completed successfully for $(date)"',
     dag=dag
 )
 
-# Task 12: Clean up temporary files
+# Task 9: Clean up temporary files
 cleanup_temp_files = BashOperator(
     task_id='cleanup_temp_files',
     bash_command='rm -rf /tmp/data/events/*',
@@ -190,8 +182,9 @@ cleanup_temp_files = BashOperator(
 )
 
 # Define task dependencies
-check_new_data >> load_raw_events >> dbt_staging >> dbt_test_staging
-dbt_test_staging >> dbt_curated >> dbt_test_curated
-dbt_test_curated >> dbt_mart >> dbt_test_mart
-dbt_test_mart >> dbt_docs >> data_quality_check
-data_quality_check >> send_success_notification >> cleanup_temp_files
+# Each dbt build runs a layer's models and tests in one process, in dependency
+# order, so a failing test stops that layer's downstream models.
+check_new_data >> load_raw_events >> dbt_build_staging
+dbt_build_staging >> dbt_build_curated >> dbt_build_mart
+dbt_build_mart >> [dbt_docs, data_quality_check] >> send_success_notification
+send_success_notification >> cleanup_temp_files
@@ -6,21 +6,57 @@ Monitors data quality metrics and sends alerts for anomalies.
 
 import os
 import json
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import List, Optional
+import requests
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
-import pandas as pd
+
+try:
+    import httpx
+except ImportError:  # Fall back to sequential posts through requests
+    httpx = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Quality checks submitted to BigQuery at the same time
+MAX_CONCURRENT_CHECKS = 8
+
+# Tables whose daily total and null counts are read from the mv_daily_quality
+# materialized view, mapped to their date partition column
+DAILY_QUALITY_VIEW_TABLES = {'stg_events': 'event_date'}
+
+# Reused HTTP session for alert webhooks
+_SESSION = requests.Session()
+
+async def _post_webhooks_async(urls: List[str], payload: dict):
+    """Post payload to every webhook URL concurrently."""
+    async with httpx.AsyncClient() as client:
+        await asyncio.gather(*[client.post(url, json=payload) for url in urls])
+
+def _post_webhooks(urls: List[str], payload: dict):
+    """Post payload to every webhook URL, concurrently when httpx is installed."""
+    if httpx is not None and len(urls) > 1:
+        asyncio.run(_post_webhooks_async(urls, payload))
+    else:
+        for url in urls:
+            _SESSION.post(url, json=payload)
+
 class DataQualityMonitor:
     def __init__(self, project_id: str, dataset_id: str):
         self.project_id = project_id
         self.dataset_id = dataset_id
         self.client = bigquery.Client(project=project_id)
+        self._pending_alerts = []
+    
+    def _query_one(self, query: str) -> Optional[bigquery.Row]:
+        """Run a query and return its first row, or None if it returned no rows."""
+        return next(iter(self.client.query(query).result()), None)
         
     def check_data_freshness(self, table_name: str, date_column: str, max_hours: int = 4) -> dict:
         """Check if data is fresh (within max_hours)."""
@@ -32,9 +68,9 @@ class DataQualityMonitor:
                 FROM `{self.project_id}.{self.dataset_id}.{table_name}`
             """
             
-            result = self.client.query(query).to_dataframe()
+            result = self._query_one(query)
             
-            if result.empty:
+            if result is None or result['latest_date'] is None:
                 return {
                     'status': 'error',
                     'message': f'No data found in {table_name}',
@@ -42,8 +78,8 @@ class DataQualityMonitor:
                     'hours_behind': None
                 }
             
-            latest_date = result['latest_date'].iloc[0]
-            hours_behind = result['hours_behind'].iloc[0]
+            latest_date = result['latest_date']
+            hours_behind = result['hours_behind']
             
             if hours_behind > max_hours:
                 return {
@@ -69,50 +105,78 @@ class DataQualityMonitor:
                 'hours_behind': None
             }
     
-    def check_data_quality(self, table_name: str) -> dict:
-        """Check data quality metrics for a table."""
+    def check_data_quality(self, table_name: str, pk_columns: Optional[List[str]] = None) -> dict:
+        """Check data quality metrics for a table.
+        
+        Duplicates are counted on pk_columns when given, otherwise on a fingerprint of the whole row.
+        """
         try:
             # Get table schema
             table_ref = self.client.dataset(self.dataset_id).table(table_name)
             table = self.client.get_table(table_ref)
             
-            # Check for null values in critical columns
-            null_checks = []
-            for field in table.schema:
-                if field.name in ['user_id', 'event_id', 'event_type', 'event_timestamp']:
-                    query = f"""
-                        SELECT 
-                            COUNT(*) as total_rows,
-                            SUM(CASE WHEN {field.name} IS NULL THEN 1 ELSE 0 END) as null_count,
-                            ROUND(SUM(CASE WHEN {field.name} IS NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) as null_percentage
-                        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-                        WHERE DATE(_PARTITIONTIME) = CURRENT_DATE() - 1
-                    """
-                    
-                    result = self.client.query(query).to_dataframe()
-                    if not result.empty:
-                        null_checks.append({
-                            'column': field.name,
-                            'total_rows': result['total_rows'].iloc[0],
-                            'null_count': result['null_count'].iloc[0],
-                            'null_percentage': result['null_percentage'].iloc[0]
-                        })
+            critical_columns = [
+                field.name for field in table.schema
+                if field.name in ['user_id', 'event_id', 'event_type', 'event_timestamp']
+            ]
+            if pk_columns and len(pk_columns) == 1:
+                unique_key = pk_columns[0]
+            elif pk_columns:
+                unique_key = f"FARM_FINGERPRINT(TO_JSON_STRING(STRUCT({', '.join(pk_columns)})))"
+            else:
+                unique_key = "FARM_FINGERPRINT(TO_JSON_STRING(t))"
+            partition_column = DAILY_QUALITY_VIEW_TABLES.get(table_name)
+            if partition_column:
+                # Total and null counts are pre-aggregated by the mv_daily_quality
+                # materialized view (sql/mv_daily_quality.sql); only the distinct
+                # count has to read the table
+                null_columns = ''.join(f", null_{column}" for column in critical_columns)
+                counts_query = f"""
+                    SELECT total_rows{null_columns}
+                    FROM `{self.project_id}.{self.dataset_id}.mv_daily_quality`
+                    WHERE event_date = CURRENT_DATE() - 1
+                """
+                unique_query = f"""
+                    SELECT COUNT(DISTINCT {unique_key}) as unique_rows
+                    FROM `{self.project_id}.{self.dataset_id}.{table_name}` t
+                    WHERE {partition_column} = CURRENT_DATE() - 1
+                """
+                
+                result = self._query_one(counts_query)
+                unique_result = self._query_one(unique_query)
+                unique_rows = unique_result['unique_rows'] if unique_result is not None else 0
+            else:
+                # Null counts for critical columns and the duplicate count, in a single scan
+                null_counts = ''.join(
+                    f",\n                        COUNTIF({column} IS NULL) as null_{column}" for column in critical_columns
+                )
+                query = f"""
+                    SELECT 
+                        COUNT(*) as total_rows,
+                        COUNT(DISTINCT {unique_key}) as unique_rows{null_counts}
+                    FROM `{self.project_id}.{self.dataset_id}.{table_name}` t
+                    WHERE DATE(_PARTITIONTIME) = CURRENT_DATE() - 1
+                """
+                
+                result = self._query_one(query)
+                unique_rows = result['unique_rows'] if result is not None else 0
+            total_rows = result['total_rows'] if result is not None else 0
             
-            # Check for duplicate records
-            duplicate_query = f"""
-                SELECT 
-                    COUNT(*) as total_rows,
-                    COUNT(DISTINCT *) as unique_rows,
-                    COUNT(*) - COUNT(DISTINCT *) as duplicate_count
-                FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-                WHERE DATE(_PARTITIONTIME) = CURRENT_DATE() - 1
-            """
+            null_checks = []
+            if result is not None:
+                for column in critical_columns:
+                    null_count = result[f'null_{column}']
+                    null_checks.append({
+                        'column': column,
+                        'total_rows': total_rows,
+                        'null_count': null_count,
+                        'null_percentage': round(null_count * 100.0 / total_rows, 2) if total_rows else None
+                    })
             
-            duplicate_result = self.client.query(duplicate_query).to_dataframe()
             duplicate_info = {
-                'total_rows': duplicate_result['total_rows'].iloc[0] if not duplicate_result.empty else 0,
-                'unique_rows': duplicate_result['unique_rows'].iloc[0] if not duplicate_result.empty else 0,
-                'duplicate_count': duplicate_result['duplicate_count'].iloc[0] if not duplicate_result.empty else 0
+                'total_rows': total_rows,
+                'unique_rows': unique_rows,
+                'duplicate_count': total_rows - unique_rows
             }
             
             return {
@@ -143,30 +207,36 @@ class DataQualityMonitor:
                 AND date = CURRENT_DATE() - 1
             """
             
-            negative_revenue_result = self.client.query(negative_revenue_query).to_dataframe()
-            negative_revenue_count = negative_revenue_result['negative_revenue_count'].iloc[0] if not negative_revenue_result.empty else 0
+            negative_revenue_result = self._query_one(negative_revenue_query)
+            negative_revenue_count = negative_revenue_result['negative_revenue_count'] if negative_revenue_result is not None else 0
             
-            # Check for future timestamps
-            future_timestamp_query = f"""
-                SELECT COUNT(*) as future_timestamp_count
-                FROM `{self.project_id}.{self.dataset_id}.stg_events`
-                WHERE event_timestamp > CURRENT_TIMESTAMP()
-                AND event_date = CURRENT_DATE() - 1
+            # Daily stg_events counts are pre-aggregated by the mv_daily_quality
+            # materialized view (sql/mv_daily_quality.sql)
+            daily_quality_query = f"""
+                SELECT 
+                    max_event_timestamp > CURRENT_TIMESTAMP() as has_future_timestamps,
+                    invalid_event_types_count
+                FROM `{self.project_id}.{self.dataset_id}.mv_daily_quality`
+                WHERE event_date = CURRENT_DATE() - 1
             """
             
-            future_timestamp_result = self.client.query(future_timestamp_query).to_dataframe()
-            future_timestamp_count = future_timestamp_result['future_timestamp_count'].iloc[0] if not future_timestamp_result.empty else 0
+            daily_quality_result = self._query_one(daily_quality_query)
+            has_future_timestamps = bool(daily_quality_result['has_future_timestamps']) if daily_quality_result is not None else False
+            invalid_event_types_count = daily_quality_result['invalid_event_types_count'] if daily_quality_result is not None else 0
             
-            # Check for invalid event types
-            invalid_event_types_query = f"""
-                SELECT COUNT(*) as invalid_event_types_count
-                FROM `{self.project_id}.{self.dataset_id}.stg_events`
-                WHERE event_type NOT IN ('purchase', 'page_view', 'signup', 'login', 'logout', 'click', 'scroll', 'search', 'filter', 'sort', 'error', 'exception', 'crash', 'session_start', 'session_end')
-                AND event_date = CURRENT_DATE() - 1
-            """
-            
-            invalid_event_types_result = self.client.query(invalid_event_types_query).to_dataframe()
-            invalid_event_types_count = invalid_event_types_result['invalid_event_types_count'].iloc[0] if not invalid_event_types_result.empty else 0
+            # Check for future timestamps; the view can't reference CURRENT_TIMESTAMP(),
+            # so the partition is only scanned when its latest event is in the future
+            future_timestamp_count = 0
+            if has_future_timestamps:
+                future_timestamp_query = f"""
+                    SELECT COUNT(*) as future_timestamp_count
+                    FROM `{self.project_id}.{self.dataset_id}.stg_events`
+                    WHERE event_timestamp > CURRENT_TIMESTAMP()
+                    AND event_date = CURRENT_DATE() - 1
+                """
+                
+                future_timestamp_result = self._query_one(future_timestamp_query)
+                future_timestamp_count = future_timestamp_result['future_timestamp_count'] if future_timestamp_result is not None else 0
             
             return {
                 'status': 'success',
@@ -202,32 +272,49 @@ class DataQualityMonitor:
             ('business_metrics', 'date')
         ]
         
-        for table_name, date_column in tables_to_check:
-            report['checks'][f'{table_name}_freshness'] = self.check_data_freshness(table_name, date_column)
+        # Check data quality for staging tables, keyed on their primary keys
+        staging_tables = {'stg_events': ['event_id'], 'stg_users': ['user_id']}
         
-        # Check data quality for staging tables
-        staging_tables = ['stg_events', 'stg_users']
-        for table_name in staging_tables:
-            report['checks'][f'{table_name}_quality'] = self.check_data_quality(table_name)
-        
-        # Check business rules
-        report['checks']['business_rules'] = self.check_business_rules()
+        # Every check is an independent BigQuery job that mostly waits on the
+        # network, so submit them all at once and collect the results in order
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CHECKS) as executor:
+            futures = {}
+            for table_name, date_column in tables_to_check:
+                futures[f'{table_name}_freshness'] = executor.submit(self.check_data_freshness, table_name, date_column)
+            for table_name, pk_columns in staging_tables.items():
+                futures[f'{table_name}_quality'] = executor.submit(self.check_data_quality, table_name, pk_columns)
+            futures['business_rules'] = executor.submit(self.check_business_rules)
+            
+            for check_name, future in futures.items():
+                report['checks'][check_name] = future.result()
         
         return report
     
     def send_alert(self, message: str, severity: str = 'warning'):
-        """Send alert notification."""
+        """Queue an alert notification; queued alerts are sent by flush_alerts()."""
         # In a real implementation, this would send to Slack, email, etc.
         logger.info(f"ALERT [{severity.upper()}]: {message}")
+        self._pending_alerts.append({'message': message, 'severity': severity})
+    
+    def flush_alerts(self):
+        """Send all queued alerts as a single Slack notification."""
+        alerts, self._pending_alerts = self._pending_alerts, []
         
-        # Example Slack notification
-        if os.getenv('SLACK_WEBHOOK_URL'):
-            import requests
+        # Example Slack notification; SLACK_WEBHOOK_URL may list several comma-separated webhooks
+        webhook_urls = [url.strip() for url in os.getenv('SLACK_WEBHOOK_URL', '').split(',') if url.strip()]
+        if alerts and webhook_urls:
             payload = {
-                'text': f'🚨 Data Quality Alert: {message}',
-                'channel': '#data-alerts'
+                'text': f'🚨 Data Quality Alert: {len(alerts)} issue(s) found',
+                'channel': '#data-alerts',
+                'attachments': [
+                    {
+                        'color': 'danger' if alert['severity'] == 'error' else 'warning',
+                        'text': alert['message']
+                    }
+                    for alert in alerts
+                ]
             }
-            requests.post(os.getenv('SLACK_WEBHOOK_URL'), json=payload)
+            _post_webhooks(webhook_urls, payload)
 
 def main():
     """Main function to run data quality monitoring."""
@@ -245,6 +332,7 @@ def main():
         if check_result['status'] in ['warning', 'error']:
             issues_found = True
             monitor.send_alert(f"{check_name}: {check_result['message']}", check_result['status'])
+    monitor.flush_alerts()
     
     if not issues_found:
         logger.info("All data quality checks passed successfully")
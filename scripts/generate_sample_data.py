@@ -4,17 +4,28 @@ Sample Data Generator for Data Platform
 Generates realistic sample data for testing and demonstration purposes.
 """
 
+import csv
 import json
-import random
-import uuid
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import multiprocessing
+import os
+import secrets
+import shutil
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
 # Configuration
 NUM_USERS = 1000
 NUM_DAYS = 30
 EVENTS_PER_USER_PER_DAY = (1, 20)  # Min, Max events per user per day
+EVENT_BATCH_USERS = 100  # Users per generated event batch
+NUM_WORKERS = os.cpu_count() or 1  # Event generation processes
+OUTPUT_DIR = "data-platform/sample_data"
 PRODUCTS = [
     "prod_001", "prod_002", "prod_003", "prod_004", "prod_005",
     "prod_006", "prod_007", "prod_008", "prod_009", "prod_010"
@@ -25,211 +36,331 @@ PLATFORMS = ["web", "mobile"]
 DEVICE_TYPES = ["desktop", "mobile", "tablet"]
 COUNTRIES = ["US", "CA", "UK", "DE", "FR", "AU", "JP", "BR"]
 SUBSCRIPTION_TIERS = ["basic", "premium", "enterprise"]
+FIRST_NAMES = ["John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
+TIMEZONES = ["America/New_York", "America/Los_Angeles", "Europe/London", "Europe/Berlin", "Asia/Tokyo"]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "company.com"]
+USER_SOURCES = ["organic", "google_ads", "facebook_ads", "referral", "email"]
+USER_CAMPAIGNS = ["summer_sale", "winter_promo", "new_user", "retention", "upsell"]
+EVENT_TYPE_WEIGHTS = [0.1, 0.4, 0.05, 0.1, 0.05, 0.15, 0.1, 0.05]
+CURRENCIES = ["USD", "EUR", "GBP", "CAD"]
+PAGES = ["/home", "/products", "/checkout", "/profile", "/search"]
+SIGNUP_SOURCES = ["google_ads", "facebook_ads", "organic", "referral"]
+SIGNUP_CAMPAIGNS = ["summer_sale", "winter_promo", "new_user"]
+ELEMENTS = ["button", "link", "image", "text"]
+SEARCH_QUERIES = ["laptop", "shirt", "book", "phone", "shoes"]
+
+# The json fallback uses orjson's compact separators and raw UTF-8 so the
+# output bytes don't depend on whether orjson is installed
+def _to_json_bytes(record: Dict[str, Any]) -> bytes:
+    """Encode a record as JSON, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode()
+
+def _to_json(value: Dict[str, Any]) -> str:
+    """Encode a metadata dict as a JSON string, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
 
-def generate_user_id() -> str:
-    """Generate a unique user ID."""
-    return f"user_{uuid.uuid4().hex[:8]}"
+def _to_iso(times: np.ndarray) -> np.ndarray:
+    """Format datetime64 values as ISO-8601 UTC strings (YYYY-MM-DDTHH:MM:SSZ)."""
+    return np.char.add(np.datetime_as_string(times, unit="s"), "Z")
 
-def generate_event_id() -> str:
-    """Generate a unique event ID."""
-    return f"evt_{uuid.uuid4().hex[:8]}"
+def _from_iso(timestamps: np.ndarray) -> np.ndarray:
+    """Parse strings produced by _to_iso back into datetime64[s] values."""
+    return np.char.rstrip(timestamps.astype(str), "Z").astype("datetime64[s]")
 
-def generate_session_id() -> str:
-    """Generate a unique session ID."""
-    return f"sess_{uuid.uuid4().hex[:8]}"
+def _sample(values: List[str], size: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw size values uniformly (with replacement) from a list."""
+    return np.asarray(values)[rng.integers(0, len(values), size)]
+
+def _id_pool(prefix: str, n: int, width: int = 16) -> np.ndarray:
+    """Generate n IDs of the form <prefix><width hex chars> from one token_hex call.
+    
+    The default 64 random bits keep collisions negligible at millions of IDs;
+    32 bits already collide within a few hundred thousand.
+    """
+    hex_chars = secrets.token_hex(width // 2 * n).encode()
+    return np.char.add(prefix, np.frombuffer(hex_chars, dtype=f"S{width}").astype(str))
 
-def generate_email(first_name: str, last_name: str) -> str:
-    """Generate a realistic email address."""
-    domains = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "company.com"]
-    return f"{first_name.lower()}.{last_name.lower()}@{random.choice(domains)}"
+def generate_emails(first_names: np.ndarray, last_names: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Generate realistic email addresses for arrays of first/last names."""
+    domains = _sample(EMAIL_DOMAINS, len(first_names), rng)
+    local_parts = np.char.add(np.char.add(np.char.lower(first_names), "."), np.char.lower(last_names))
+    return np.char.add(np.char.add(local_parts, "@"), domains)
 
-def generate_user_data() -> List[Dict[str, Any]]:
+def generate_user_data(now: Optional[np.datetime64] = None) -> pd.DataFrame:
     """Generate sample user data."""
-    users = []
-    first_names = ["John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
-    last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
-    
-    for i in range(NUM_USERS):
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
-        created_at = datetime.now() - timedelta(days=random.randint(1, 365))
-        
-        user = {
-            "user_id": generate_user_id(),
-            "email": generate_email(first_name, last_name),
-            "created_at": created_at.isoformat() + "Z",
-            "updated_at": (created_at + timedelta(days=random.randint(0, 30))).isoformat() + "Z",
-            "first_name": first_name,
-            "last_name": last_name,
-            "country": random.choice(COUNTRIES),
-            "timezone": random.choice(["America/New_York", "America/Los_Angeles", "Europe/London", "Europe/Berlin", "Asia/Tokyo"]),
-            "subscription_tier": random.choices(SUBSCRIPTION_TIERS, weights=[0.6, 0.3, 0.1])[0],
-            "metadata": json.dumps({
-                "source": random.choice(["organic", "google_ads", "facebook_ads", "referral", "email"]),
-                "campaign": random.choice(["summer_sale", "winter_promo", "new_user", "retention", "upsell"]),
-                "referral_code": f"REF{random.randint(1000, 9999)}" if random.random() < 0.2 else None
-            })
-        }
-        users.append(user)
-    
-    return users
-
-def generate_event_data(users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Generate sample event data."""
-    events = []
-    start_date = datetime.now() - timedelta(days=NUM_DAYS)
-    
-    for user in users:
-        user_id = user["user_id"]
-        user_created_at = datetime.fromisoformat(user["created_at"].replace("Z", ""))
-        
-        # Generate events for each day
-        for day_offset in range(NUM_DAYS):
-            event_date = start_date + timedelta(days=day_offset)
-            
-            # Skip days before user was created
-            if event_date.date() < user_created_at.date():
-                continue
-            
-            # Determine number of events for this user on this day
-            num_events = random.randint(*EVENTS_PER_USER_PER_DAY)
-            
-            # Generate session for this day
-            session_id = generate_session_id()
-            session_start = event_date + timedelta(hours=random.randint(8, 20), minutes=random.randint(0, 59))
-            
-            for event_num in range(num_events):
-                event_time = session_start + timedelta(minutes=random.randint(0, 120))
-                event_type = random.choices(EVENT_TYPES, weights=[0.1, 0.4, 0.05, 0.1, 0.05, 0.15, 0.1, 0.05])[0]
-                
-                # Generate metadata based on event type
-                metadata = {}
-                if event_type == "purchase":
-                    metadata = {
-                        "amount": round(random.uniform(10, 500), 2),
-                        "currency": random.choice(["USD", "EUR", "GBP", "CAD"]),
-                        "product_id": random.choice(PRODUCTS),
-                        "category": random.choice(CATEGORIES)
-                    }
-                elif event_type == "page_view":
-                    metadata = {
-                        "page": random.choice(["/home", "/products", "/checkout", "/profile", "/search"]),
-                        "category": random.choice(CATEGORIES)
-                    }
-                elif event_type == "signup":
-                    metadata = {
-                        "source": random.choice(["google_ads", "facebook_ads", "organic", "referral"]),
-                        "campaign": random.choice(["summer_sale", "winter_promo", "new_user"])
-                    }
-                elif event_type in ["click", "scroll"]:
-                    metadata = {
-                        "element": random.choice(["button", "link", "image", "text"]),
-                        "page": random.choice(["/home", "/products", "/checkout", "/profile"])
-                    }
-                elif event_type == "search":
-                    metadata = {
-                        "query": random.choice(["laptop", "shirt", "book", "phone", "shoes"]),
-                        "results_count": random.randint(0, 100)
-                    }
-                
-                event = {
-                    "event_id": generate_event_id(),
-                    "user_id": user_id,
-                    "event_type": event_type,
-                    "event_timestamp": event_time.isoformat() + "Z",
-                    "session_id": session_id,
-                    "device_type": random.choice(DEVICE_TYPES),
-                    "platform": random.choice(PLATFORMS),
-                    "app_version": f"{random.randint(1, 3)}.{random.randint(0, 9)}.{random.randint(0, 9)}",
-                    "metadata": json.dumps(metadata),
-                    "created_at": datetime.now().isoformat() + "Z"
-                }
-                events.append(event)
-    
-    return events
-
-def generate_session_data(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng()
+    now = np.datetime64("now", "s") if now is None else now
+    
+    first_names = _sample(FIRST_NAMES, NUM_USERS, rng)
+    last_names = _sample(LAST_NAMES, NUM_USERS, rng)
+    created_at = now.astype("datetime64[s]") - rng.integers(1, 366, NUM_USERS).astype("timedelta64[D]")
+    updated_at = created_at + rng.integers(0, 31, NUM_USERS).astype("timedelta64[D]")
+    
+    # Metadata is the only column that still needs a per-row JSON encode
+    sources = _sample(USER_SOURCES, NUM_USERS, rng)
+    campaigns = _sample(USER_CAMPAIGNS, NUM_USERS, rng)
+    referral_codes = rng.integers(1000, 10000, NUM_USERS)
+    has_referral = rng.random(NUM_USERS) < 0.2
+    metadata = [
+        _to_json({
+            "source": source,
+            "campaign": campaign,
+            "referral_code": f"REF{code}" if referral else None
+        })
+        for source, campaign, code, referral in zip(
+            sources.tolist(), campaigns.tolist(), referral_codes.tolist(), has_referral.tolist()
+        )
+    ]
+    
+    return pd.DataFrame({
+        "user_id": _id_pool("user_", NUM_USERS),
+        "email": generate_emails(first_names, last_names, rng),
+        "created_at": _to_iso(created_at),
+        "updated_at": _to_iso(updated_at),
+        "first_name": first_names,
+        "last_name": last_names,
+        "country": _sample(COUNTRIES, NUM_USERS, rng),
+        "timezone": _sample(TIMEZONES, NUM_USERS, rng),
+        "subscription_tier": rng.choice(SUBSCRIPTION_TIERS, size=NUM_USERS, p=[0.6, 0.3, 0.1]),
+        "metadata": metadata
+    })
+
+def generate_event_metadata(event_types: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Generate per-event JSON metadata, one vectorized branch per event type."""
+    metadata = np.full(len(event_types), _to_json({}), dtype=object)
+    
+    idx = np.flatnonzero(event_types == "purchase")
+    metadata[idx] = [
+        _to_json({"amount": amount, "currency": currency, "product_id": product_id, "category": category})
+        for amount, currency, product_id, category in zip(
+            np.round(rng.uniform(10, 500, len(idx)), 2).tolist(),
+            _sample(CURRENCIES, len(idx), rng).tolist(),
+            _sample(PRODUCTS, len(idx), rng).tolist(),
+            _sample(CATEGORIES, len(idx), rng).tolist()
+        )
+    ]
+    
+    idx = np.flatnonzero(event_types == "page_view")
+    metadata[idx] = [
+        _to_json({"page": page, "category": category})
+        for page, category in zip(
+            _sample(PAGES, len(idx), rng).tolist(),
+            _sample(CATEGORIES, len(idx), rng).tolist()
+        )
+    ]
+    
+    idx = np.flatnonzero(event_types == "signup")
+    metadata[idx] = [
+        _to_json({"source": source, "campaign": campaign})
+        for source, campaign in zip(
+            _sample(SIGNUP_SOURCES, len(idx), rng).tolist(),
+            _sample(SIGNUP_CAMPAIGNS, len(idx), rng).tolist()
+        )
+    ]
+    
+    idx = np.flatnonzero(np.isin(event_types, ["click", "scroll"]))
+    metadata[idx] = [
+        _to_json({"element": element, "page": page})
+        for element, page in zip(
+            _sample(ELEMENTS, len(idx), rng).tolist(),
+            _sample(PAGES[:4], len(idx), rng).tolist()
+        )
+    ]
+    
+    idx = np.flatnonzero(event_types == "search")
+    metadata[idx] = [
+        _to_json({"query": query, "results_count": results_count})
+        for query, results_count in zip(
+            _sample(SEARCH_QUERIES, len(idx), rng).tolist(),
+            rng.integers(0, 101, len(idx)).tolist()
+        )
+    ]
+    
+    return metadata
+
+def generate_event_data(
+    users: pd.DataFrame, now: Optional[np.datetime64] = None, seed: Optional[np.random.SeedSequence] = None
+) -> Iterator[pd.DataFrame]:
+    """Generate sample event data, one batch of EVENT_BATCH_USERS users at a time."""
+    rng = np.random.default_rng(seed)
+    now = np.datetime64("now", "s") if now is None else now
+    for start in range(0, len(users), EVENT_BATCH_USERS):
+        yield _generate_event_batch(users.iloc[start:start + EVENT_BATCH_USERS], now, rng)
+
+def _generate_event_batch(users: pd.DataFrame, now: np.datetime64, rng: np.random.Generator) -> pd.DataFrame:
+    """Generate the events for a batch of users."""
+    num_users = len(users)
+    start_date = now.astype("datetime64[D]") - NUM_DAYS
+    event_days = start_date + np.arange(NUM_DAYS)
+    
+    # Events per user per day; days before the user was created get none
+    created_days = users["created_at"].str[:10].to_numpy().astype("datetime64[D]")
+    counts = rng.integers(EVENTS_PER_USER_PER_DAY[0], EVENTS_PER_USER_PER_DAY[1] + 1, (num_users, NUM_DAYS))
+    counts[event_days[None, :] < created_days[:, None]] = 0
+    
+    # One session per active user-day, starting between 08:00 and 20:59
+    active = counts > 0
+    num_sessions = int(active.sum())
+    session_ids = _id_pool("sess_", num_sessions)
+    session_days = np.broadcast_to(event_days, counts.shape)[active]
+    session_starts = (
+        session_days.astype("datetime64[s]")
+        + rng.integers(8, 21, num_sessions).astype("timedelta64[h]")
+        + rng.integers(0, 60, num_sessions).astype("timedelta64[m]")
+    )
+    
+    # Expand sessions to events; row-major order keeps events grouped by user
+    session_idx = np.repeat(np.arange(num_sessions), counts[active])
+    total = len(session_idx)
+    event_times = session_starts[session_idx] + rng.integers(0, 121, total).astype("timedelta64[m]")
+    event_types = rng.choice(EVENT_TYPES, size=total, p=EVENT_TYPE_WEIGHTS)
+    app_versions = np.char.add(
+        np.char.add(rng.integers(1, 4, total).astype(str), "."),
+        np.char.add(np.char.add(rng.integers(0, 10, total).astype(str), "."), rng.integers(0, 10, total).astype(str))
+    )
+    
+    return pd.DataFrame({
+        "event_id": _id_pool("evt_", total),
+        "user_id": np.repeat(users["user_id"].to_numpy(), counts.sum(axis=1)),
+        "event_type": event_types,
+        "event_timestamp": _to_iso(event_times),
+        "session_id": session_ids[session_idx],
+        "device_type": _sample(DEVICE_TYPES, total, rng),
+        "platform": _sample(PLATFORMS, total, rng),
+        "app_version": app_versions,
+        "metadata": generate_event_metadata(event_types, rng),
+        "created_at": np.datetime_as_string(now, unit="s") + "Z"
+    })
+
+def generate_session_data(events: pd.DataFrame) -> List[Dict[str, Any]]:
     """Generate session data from events."""
-    sessions = {}
-    
-    for event in events:
-        session_id = event["session_id"]
-        user_id = event["user_id"]
-        event_time = datetime.fromisoformat(event["event_timestamp"].replace("Z", ""))
-        
-        if session_id not in sessions:
-            sessions[session_id] = {
-                "session_id": session_id,
-                "user_id": user_id,
-                "started_at": event_time.isoformat() + "Z",
-                "ended_at": None,
-                "duration_seconds": None,
-                "page_views": 0,
-                "events_count": 0,
-                "device_type": event["device_type"],
-                "platform": event["platform"],
-                "country": None,
-                "metadata": json.dumps({})
-            }
-        
-        sessions[session_id]["events_count"] += 1
-        if event["event_type"] == "page_view":
-            sessions[session_id]["page_views"] += 1
-        
-        # Update end time
-        if sessions[session_id]["ended_at"] is None or event_time > datetime.fromisoformat(sessions[session_id]["ended_at"].replace("Z", "")):
-            sessions[session_id]["ended_at"] = event_time.isoformat() + "Z"
-    
-    # Calculate durations
-    for session in sessions.values():
-        if session["ended_at"]:
-            start = datetime.fromisoformat(session["started_at"].replace("Z", ""))
-            end = datetime.fromisoformat(session["ended_at"].replace("Z", ""))
-            session["duration_seconds"] = int((end - start).total_seconds())
-    
-    return list(sessions.values())
-
-def save_to_csv(data: List[Dict[str, Any]], filename: str):
-    """Save data to CSV file."""
-    df = pd.DataFrame(data)
-    df.to_csv(filename, index=False)
-    print(f"Saved {len(data)} records to {filename}")
-
-def save_to_json(data: List[Dict[str, Any]], filename: str):
-    """Save data to JSON file."""
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
-    print(f"Saved {len(data)} records to {filename}")
+    # Fixed-width ISO timestamps sort chronologically, so min/max work on the
+    # strings and only the per-session bounds need parsing for the duration
+    events = events.assign(is_page_view=events["event_type"] == "page_view")
+    sessions = events.groupby("session_id", sort=False).agg(
+        user_id=("user_id", "first"),
+        started_at=("event_timestamp", "min"),
+        ended_at=("event_timestamp", "max"),
+        page_views=("is_page_view", "sum"),
+        events_count=("event_id", "size"),
+        device_type=("device_type", "first"),
+        platform=("platform", "first")
+    ).reset_index()
+    
+    started_at = _from_iso(sessions["started_at"].to_numpy())
+    ended_at = _from_iso(sessions["ended_at"].to_numpy())
+    sessions["duration_seconds"] = (ended_at - started_at).astype("int64")
+    sessions["country"] = None
+    sessions["metadata"] = _to_json({})
+    
+    columns = [
+        "session_id", "user_id", "started_at", "ended_at", "duration_seconds", "page_views",
+        "events_count", "device_type", "platform", "country", "metadata"
+    ]
+    return sessions[columns].to_dict(orient="records")
+
+def save_to_csv(records: Iterable[Dict[str, Any]], filename: str):
+    """Stream records to a CSV file."""
+    count = 0
+    with open(filename, 'w', newline='') as f:
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+            count += 1
+    print(f"Saved {count} records to {filename}")
+
+def save_to_jsonl(records: Iterable[Dict[str, Any]], filename: str):
+    """Stream records to a JSON Lines file."""
+    count = 0
+    with open(filename, 'wb') as f:
+        for record in records:
+            f.write(_to_json_bytes(record))
+            f.write(b"\n")
+            count += 1
+    print(f"Saved {count} records to {filename}")
+
+def _generate_events_shard(
+    users: pd.DataFrame, shard_idx: int, now: np.datetime64, seed: np.random.SeedSequence
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Write one shard's events to events.part-<shard_idx> files and return (event count, sessions).
+    
+    Each batch is written to both event files and aggregated into sessions,
+    then dropped. A session never spans users, so per-batch aggregation is exact.
+    """
+    sessions = []
+    num_events = 0
+    csv_path = os.path.join(OUTPUT_DIR, f"events.part-{shard_idx}.csv")
+    jsonl_path = os.path.join(OUTPUT_DIR, f"events.part-{shard_idx}.jsonl")
+    with open(csv_path, 'w', newline='') as csv_file, open(jsonl_path, 'wb') as jsonl_file:
+        csv_writer = None
+        for batch in generate_event_data(users, now, seed=seed):
+            records = batch.to_dict(orient="records")
+            if csv_writer is None:
+                csv_writer = csv.DictWriter(csv_file, fieldnames=list(batch.columns))
+                # Only the first shard carries the header, so parts concatenate as-is
+                if shard_idx == 0:
+                    csv_writer.writeheader()
+            csv_writer.writerows(records)
+            jsonl_file.writelines(_to_json_bytes(record) + b"\n" for record in records)
+            sessions.extend(generate_session_data(batch))
+            num_events += len(records)
+    return num_events, sessions
+
+def _concat_parts(part_paths: List[str], filename: str):
+    """Concatenate shard files into one file and remove the parts."""
+    with open(filename, 'wb') as out:
+        for part_path in part_paths:
+            with open(part_path, 'rb') as part:
+                shutil.copyfileobj(part, out)
+            os.remove(part_path)
 
 def main():
     """Generate and save sample data."""
     print("Generating sample data...")
     
+    # One clock snapshot for the whole run, shared by every generator
+    now = np.datetime64("now", "s")
+    
     # Generate users
     print("Generating users...")
-    users = generate_user_data()
-    save_to_csv(users, "data-platform/sample_data/users.csv")
-    save_to_json(users, "data-platform/sample_data/users.json")
-    
-    # Generate events
-    print("Generating events...")
-    events = generate_event_data(users)
-    save_to_csv(events, "data-platform/sample_data/events.csv")
-    save_to_json(events, "data-platform/sample_data/events.json")
-    
-    # Generate sessions
-    print("Generating sessions...")
-    sessions = generate_session_data(events)
-    save_to_csv(sessions, "data-platform/sample_data/sessions.csv")
-    save_to_json(sessions, "data-platform/sample_data/sessions.json")
+    users = generate_user_data(now)
+    user_records = users.to_dict(orient="records")
+    save_to_csv(user_records, os.path.join(OUTPUT_DIR, "users.csv"))
+    save_to_jsonl(user_records, os.path.join(OUTPUT_DIR, "users.jsonl"))
+    
+    # Generate events and sessions, one user shard per process
+    num_workers = max(1, min(NUM_WORKERS, len(users)))
+    print(f"Generating events and sessions with {num_workers} workers...")
+    # Each shard draws from its own child of one fresh SeedSequence, so the
+    # shards' streams are independent of each other and of previous runs
+    seeds = np.random.SeedSequence().spawn(num_workers)
+    shards = [(users.iloc[i::num_workers], i, now, seeds[i]) for i in range(num_workers)]
+    with multiprocessing.Pool(num_workers) as pool:
+        results = pool.starmap(_generate_events_shard, shards)
+    num_events = sum(shard_events for shard_events, _ in results)
+    sessions = [session for _, shard_sessions in results for session in shard_sessions]
+    
+    for ext in ("csv", "jsonl"):
+        filename = os.path.join(OUTPUT_DIR, f"events.{ext}")
+        _concat_parts([os.path.join(OUTPUT_DIR, f"events.part-{i}.{ext}") for i in range(num_workers)], filename)
+        print(f"Saved {num_events} records to {filename}")
+    
+    save_to_csv(sessions, os.path.join(OUTPUT_DIR, "sessions.csv"))
+    save_to_jsonl(sessions, os.path.join(OUTPUT_DIR, "sessions.jsonl"))
     
     print(f"\nSample data generation complete!")
     print(f"Generated {len(users)} users")
-    print(f"Generated {len(events)} events")
+    print(f"Generated {num_events} events")
     print(f"Generated {len(sessions)} sessions")
-    print(f"Data saved to data-platform/sample_data/")
+    print(f"Data saved to {OUTPUT_DIR}/")
 
 if __name__ == "__main__":
     main()
-
-
@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 """
 Simple Data Generator for dbt Cloud
-Generates sample data and saves to CSV files that can be uploaded to BigQuery
+Generates sample data and saves to Parquet files that can be uploaded to BigQuery
 """
 
 import json
-import random
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
 import uuid
 
 def generate_sample_data():
@@ -26,141 +25,114 @@ def generate_sample_data():
     device_types = ["desktop", "mobile", "tablet"]
     categories = ["electronics", "clothing", "books", "home", "sports", "beauty"]
     
+    rng = np.random.default_rng()
+    now = pd.Timestamp.now(tz="UTC").floor("s")
+    
     # Generate users
     print("Generating users...")
-    users = []
-    for i in range(num_users):
-        user_id = f"user_{i+1:04d}"
-        first_name = f"User{i+1}"
-        last_name = "Example"
-        email = f"user{i+1}@example.com"
-        
-        user = {
-            "user_id": user_id,
-            "email": email,
-            "created_at": (datetime.now() - timedelta(days=random.randint(1, 365))).isoformat() + "Z",
-            "updated_at": (datetime.now() - timedelta(days=random.randint(0, 30))).isoformat() + "Z",
-            "first_name": first_name,
-            "last_name": last_name,
-            "country": random.choice(countries),
-            "timezone": "America/New_York",
-            "subscription_tier": random.choice(subscription_tiers),
-            "metadata": json.dumps({"source": "sample_data", "campaign": "demo"})
-        }
-        users.append(user)
+    user_numbers = np.arange(1, num_users + 1).astype(str)
+    user_ids = np.char.add("user_", np.char.zfill(user_numbers, 4))
+    users_df = pd.DataFrame({
+        "user_id": user_ids,
+        "email": np.char.add(np.char.add("user", user_numbers), "@example.com"),
+        "created_at": now - pd.to_timedelta(rng.integers(1, 366, num_users), unit="D"),
+        "updated_at": now - pd.to_timedelta(rng.integers(0, 31, num_users), unit="D"),
+        "first_name": np.char.add("User", user_numbers),
+        "last_name": "Example",
+        "country": np.asarray(countries)[rng.integers(0, len(countries), num_users)],
+        "timezone": "America/New_York",
+        "subscription_tier": np.asarray(subscription_tiers)[rng.integers(0, len(subscription_tiers), num_users)],
+        "metadata": json.dumps({"source": "sample_data", "campaign": "demo"})
+    })
     
     # Generate events
     print("Generating events...")
-    events = []
-    user_ids = [user["user_id"] for user in users]
+    pages = ["/home", "/products", "/checkout", "/profile", "/search"]
+    sources = ["google_ads", "facebook_ads", "organic", "referral"]
+    campaigns = ["summer_sale", "winter_promo", "new_user"]
+    session_ids = np.char.add("sess_", np.char.zfill(np.arange(1, 51).astype(str), 3))
     
-    for i in range(num_events):
-        user_id = random.choice(user_ids)
-        event_type = random.choice(event_types)
-        event_time = datetime.now() - timedelta(
-            days=random.randint(0, num_days),
-            hours=random.randint(0, 23),
-            minutes=random.randint(0, 59)
-        )
-        
-        # Generate metadata based on event type
-        metadata = {}
-        if event_type == "purchase":
-            metadata = {
-                "amount": round(random.uniform(10, 500), 2),
-                "currency": "USD",
-                "product_id": f"prod_{random.randint(1, 10):03d}",
-                "category": random.choice(categories)
-            }
-        elif event_type == "page_view":
-            metadata = {
-                "page": random.choice(["/home", "/products", "/checkout", "/profile", "/search"]),
-                "category": random.choice(categories)
-            }
-        elif event_type == "signup":
-            metadata = {
-                "source": random.choice(["google_ads", "facebook_ads", "organic", "referral"]),
-                "campaign": random.choice(["summer_sale", "winter_promo", "new_user"])
-            }
-        
-        event = {
-            "event_id": f"evt_{i+1:06d}",
-            "user_id": user_id,
-            "event_type": event_type,
-            "event_timestamp": event_time.isoformat() + "Z",
-            "session_id": f"sess_{random.randint(1, 50):03d}",
-            "device_type": random.choice(device_types),
-            "platform": random.choice(platforms),
-            "app_version": "1.0.0",
-            "metadata": json.dumps(metadata),
-            "created_at": datetime.now().isoformat() + "Z"
-        }
-        events.append(event)
+    event_type = np.asarray(event_types)[rng.integers(0, len(event_types), num_events)]
     
-    # Generate sessions
-    print("Generating sessions...")
-    sessions = {}
+    # Generate metadata based on event type, rendering the JSON for every
+    # event with column-wise string concatenation
+    amounts = pd.Series(np.round(rng.uniform(10, 500, num_events), 2)).astype(str)
+    product_ids = pd.Series(rng.integers(1, 11, num_events)).astype(str).str.zfill(3)
+    event_categories = pd.Series(np.asarray(categories)[rng.integers(0, len(categories), num_events)])
+    event_pages = pd.Series(np.asarray(pages)[rng.integers(0, len(pages), num_events)])
+    event_sources = pd.Series(np.asarray(sources)[rng.integers(0, len(sources), num_events)])
+    event_campaigns = pd.Series(np.asarray(campaigns)[rng.integers(0, len(campaigns), num_events)])
+    purchase_metadata = (
+        '{"amount": ' + amounts + ', "currency": "USD", "product_id": "prod_' + product_ids
+        + '", "category": "' + event_categories + '"}'
+    )
+    page_view_metadata = '{"page": "' + event_pages + '", "category": "' + event_categories + '"}'
+    signup_metadata = '{"source": "' + event_sources + '", "campaign": "' + event_campaigns + '"}'
+    metadata = np.select(
+        [event_type == "purchase", event_type == "page_view", event_type == "signup"],
+        [purchase_metadata, page_view_metadata, signup_metadata],
+        default="{}"
+    )
     
-    for event in events:
-        session_id = event["session_id"]
-        user_id = event["user_id"]
-        event_time = datetime.fromisoformat(event["event_timestamp"].replace("Z", ""))
-        
-        if session_id not in sessions:
-            sessions[session_id] = {
-                "session_id": session_id,
-                "user_id": user_id,
-                "started_at": event_time.isoformat() + "Z",
-                "ended_at": None,
-                "duration_seconds": None,
-                "page_views": 0,
-                "events_count": 0,
-                "device_type": event["device_type"],
-                "platform": event["platform"],
-                "country": None,
-                "metadata": json.dumps({})
-            }
-        
-        sessions[session_id]["events_count"] += 1
-        if event["event_type"] == "page_view":
-            sessions[session_id]["page_views"] += 1
-        
-        # Update end time
-        if sessions[session_id]["ended_at"] is None or event_time > datetime.fromisoformat(sessions[session_id]["ended_at"].replace("Z", "")):
-            sessions[session_id]["ended_at"] = event_time.isoformat() + "Z"
+    event_time = now - pd.to_timedelta(rng.integers(0, num_days * 24 * 60, num_events), unit="m")
+    events_df = pd.DataFrame({
+        "event_id": np.char.add("evt_", np.char.zfill(np.arange(1, num_events + 1).astype(str), 6)),
+        "user_id": user_ids[rng.integers(0, num_users, num_events)],
+        "event_type": event_type,
+        "event_timestamp": event_time,
+        "session_id": session_ids[rng.integers(0, len(session_ids), num_events)],
+        "device_type": np.asarray(device_types)[rng.integers(0, len(device_types), num_events)],
+        "platform": np.asarray(platforms)[rng.integers(0, len(platforms), num_events)],
+        "app_version": "1.0.0",
+        "metadata": metadata,
+        "created_at": now
+    })
     
-    # Calculate durations
-    for session in sessions.values():
-        if session["ended_at"]:
-            start = datetime.fromisoformat(session["started_at"].replace("Z", ""))
-            end = datetime.fromisoformat(session["ended_at"].replace("Z", ""))
-            session["duration_seconds"] = int((end - start).total_seconds())
+    # Generate sessions
+    print("Generating sessions...")
+    sessions_df = events_df.assign(
+        event_time=event_time,
+        is_page_view=event_type == "page_view"
+    ).groupby("session_id", sort=False).agg(
+        user_id=("user_id", "first"),
+        started_at=("event_time", "min"),
+        ended_at=("event_time", "max"),
+        page_views=("is_page_view", "sum"),
+        events_count=("event_id", "size"),
+        device_type=("device_type", "first"),
+        platform=("platform", "first")
+    ).reset_index()
+    sessions_df["duration_seconds"] = (sessions_df["ended_at"] - sessions_df["started_at"]).dt.total_seconds().astype(int)
+    sessions_df["country"] = None
+    sessions_df["metadata"] = json.dumps({})
+    sessions_df = sessions_df[[
+        "session_id", "user_id", "started_at", "ended_at", "duration_seconds", "page_views",
+        "events_count", "device_type", "platform", "country", "metadata"
+    ]]
     
-    # Save to CSV files
-    print("Saving to CSV files...")
+    # Save to Parquet files; timestamp columns are written as UTC timestamps
+    print("Saving to Parquet files...")
     
     # Create sample_data directory
     import os
     os.makedirs("sample_data", exist_ok=True)
     
     # Save users
-    users_df = pd.DataFrame(users)
-    users_df.to_csv("sample_data/users.csv", index=False)
-    print(f"Saved {len(users)} users to sample_data/users.csv")
+    users_df.to_parquet("sample_data/users.parquet", engine="pyarrow", compression="snappy", index=False)
+    print(f"Saved {len(users_df)} users to sample_data/users.parquet")
     
     # Save events
-    events_df = pd.DataFrame(events)
-    events_df.to_csv("sample_data/events.csv", index=False)
-    print(f"Saved {len(events)} events to sample_data/events.csv")
+    events_df.to_parquet("sample_data/events.parquet", engine="pyarrow", compression="snappy", index=False)
+    print(f"Saved {len(events_df)} events to sample_data/events.parquet")
     
     # Save sessions
-    sessions_df = pd.DataFrame(list(sessions.values()))
-    sessions_df.to_csv("sample_data/sessions.csv", index=False)
-    print(f"Saved {len(sessions)} sessions to sample_data/sessions.csv")
+    sessions_df.to_parquet("sample_data/sessions.parquet", engine="pyarrow", compression="snappy", index=False)
+    print(f"Saved {len(sessions_df)} sessions to sample_data/sessions.parquet")
     
     print("\n✅ Sample data generation complete!")
     print("\nNext steps:")
-    print("1. Upload these CSV files to BigQuery manually or use dbt Cloud")
+    print("1. Upload these Parquet files to BigQuery manually or use dbt Cloud")
+    print("   (or stage them in GCS and run trial_data_ingestion.py with SAMPLE_DATA_URI set)")
     print("2. Or use the SQL queries in sql/sample_queries/ to create sample data directly in BigQuery")
 
 if __name__ == "__main__":
@@ -8,27 +8,187 @@ without requiring Pub/Sub or Cloud Run (which need billing accounts).
 import os
 import json
 import time
-import random
-from datetime import datetime, timedelta
+import uuid
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
-from google.cloud.exceptions import NotFound
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
 
+try:
+    from google.cloud import bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import types as storage_types, writer as storage_writer
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+except ImportError:  # Fall back to load jobs and REST result downloads
+    bigquery_storage_v1 = None
+
+# Raw table schemas
+EVENTS_SCHEMA = [
+    bigquery.SchemaField("event_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("user_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("event_type", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("event_timestamp", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("session_id", "STRING"),
+    bigquery.SchemaField("device_type", "STRING"),
+    bigquery.SchemaField("platform", "STRING"),
+    bigquery.SchemaField("app_version", "STRING"),
+    bigquery.SchemaField("metadata", "JSON"),
+    bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
+]
+
+USERS_SCHEMA = [
+    bigquery.SchemaField("user_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("email", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("updated_at", "TIMESTAMP"),
+    bigquery.SchemaField("first_name", "STRING"),
+    bigquery.SchemaField("last_name", "STRING"),
+    bigquery.SchemaField("country", "STRING"),
+    bigquery.SchemaField("timezone", "STRING"),
+    bigquery.SchemaField("subscription_tier", "STRING"),
+    bigquery.SchemaField("metadata", "JSON"),
+]
+
+# Sample data value pools
+COUNTRIES = np.array(["US", "CA", "UK", "DE", "FR"])
+SUBSCRIPTION_TIERS = np.array(["basic", "premium", "enterprise"])
+EVENT_TYPES = np.array(["purchase", "page_view", "signup", "login", "click", "scroll"])
+PLATFORMS = np.array(["web", "mobile"])
+DEVICE_TYPES = np.array(["desktop", "mobile", "tablet"])
+CATEGORIES = np.array(["electronics", "clothing", "books"])
+PAGES = np.array(["/home", "/products", "/checkout", "/profile"])
+SESSION_IDS = np.char.add("sess_", np.char.zfill(np.arange(1, 51).astype(str), 3))
+
+# Connection pool for the BigQuery REST client, sized for concurrent load jobs and queries
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+
+# Event counts from which generation is split across processes
+PARALLEL_MIN_EVENTS = 100_000
+
+# Rows per AppendRowsRequest sent through the Storage Write API
+STORAGE_WRITE_BATCH_ROWS = 500
+
+def _proto_descriptor(name: str, schema) -> "descriptor_pb2.DescriptorProto":
+    """Build a proto2 descriptor matching a BigQuery schema (TIMESTAMP as epoch micros)."""
+    descriptor = descriptor_pb2.DescriptorProto(name=name)
+    for number, field in enumerate(schema, start=1):
+        descriptor.field.add(
+            name=field.name,
+            number=number,
+            type=(
+                descriptor_pb2.FieldDescriptorProto.TYPE_INT64
+                if field.field_type == "TIMESTAMP"
+                else descriptor_pb2.FieldDescriptorProto.TYPE_STRING
+            ),
+            label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+        )
+    return descriptor
+
+def _proto_row_schema(name: str, schema):
+    """Compile a BigQuery schema into its row message class and Storage Write API ProtoSchema."""
+    descriptor = _proto_descriptor(name, schema)
+    file_proto = descriptor_pb2.FileDescriptorProto(name=f"{name}.proto")
+    file_proto.message_type.add().CopyFrom(descriptor)
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    row_class = message_factory.GetMessageClass(pool.FindMessageTypeByName(name))
+    return row_class, storage_types.ProtoSchema(proto_descriptor=descriptor)
+
+def _storage_rows(df: pd.DataFrame):
+    """Return DataFrame rows as dicts with datetime columns converted to epoch micros."""
+    df = df.copy()
+    for column in df.select_dtypes(include="datetime").columns:
+        df[column] = df[column].astype("datetime64[us]").astype("int64")
+    return iter(df.to_dict(orient="records"))
+
+def _gen_events_chunk(spec) -> pd.DataFrame:
+    """Generate events numbered from start; spec is (start, num_events, user_ids, now, seed, id_prefix)."""
+    start, num_events, user_ids, now, seed, id_prefix = spec
+    rng = np.random.default_rng(seed)
+    
+    event_type = pd.Categorical.from_codes(rng.integers(0, len(EVENT_TYPES), num_events), categories=EVENT_TYPES)
+    
+    # Generate metadata based on event type, rendering the JSON for every
+    # event with column-wise string concatenation
+    amounts = pd.Series(np.round(rng.uniform(10, 500, num_events), 2)).astype(str)
+    product_ids = pd.Series(rng.integers(1, 11, num_events)).astype(str).str.zfill(3)
+    event_categories = pd.Series(CATEGORIES[rng.integers(0, len(CATEGORIES), num_events)])
+    event_pages = pd.Series(PAGES[rng.integers(0, len(PAGES), num_events)])
+    purchase_metadata = (
+        '{"amount": ' + amounts + ', "currency": "USD", "product_id": "prod_' + product_ids
+        + '", "category": "' + event_categories + '"}'
+    )
+    page_view_metadata = '{"page": "' + event_pages + '", "category": "' + event_categories + '"}'
+    metadata = np.where(
+        event_type == "purchase", purchase_metadata,
+        np.where(event_type == "page_view", page_view_metadata, "{}")
+    )
+    
+    # Low-cardinality columns are categorical, which keeps them dictionary-encoded
+    return pd.DataFrame({
+        "event_id": id_prefix + pd.Series(np.arange(start, start + num_events)).astype(str).str.zfill(6),
+        "user_id": user_ids[rng.integers(0, len(user_ids), num_events)],
+        "event_type": event_type,
+        "event_timestamp": now - rng.integers(0, 30 * 24 * 60, num_events).astype("timedelta64[m]"),
+        "session_id": SESSION_IDS[rng.integers(0, len(SESSION_IDS), num_events)],
+        "device_type": pd.Categorical.from_codes(rng.integers(0, len(DEVICE_TYPES), num_events), categories=DEVICE_TYPES),
+        "platform": pd.Categorical.from_codes(rng.integers(0, len(PLATFORMS), num_events), categories=PLATFORMS),
+        "app_version": "1.0.0",
+        "metadata": metadata,
+        "created_at": now
+    })
+
 class TrialDataIngestion:
     def __init__(self, project_id: str):
         self.project_id = project_id
-        self.client = bigquery.Client(project=project_id)
+        
+        # Share one pooled HTTP session across the client's threads; the default
+        # pool keeps only 10 connections per host
+        credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+        session = AuthorizedSession(credentials)
+        session.mount('https://', HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE))
+        self.client = bigquery.Client(project=project_id, credentials=credentials, _http=session)
+        self._bqstorage_client = None
+        self._bqwrite_client = None
+        
+        # Load configs and Storage Write API row schemas are built once and
+        # shared by every load; load_table_from_dataframe copies the config
+        # before filling it in, so concurrent loads can share one object
+        self._users_truncate_cfg = bigquery.LoadJobConfig(
+            schema=USERS_SCHEMA,
+            write_disposition="WRITE_TRUNCATE",  # Replace existing data
+            source_format=bigquery.SourceFormat.PARQUET
+        )
+        self._events_truncate_cfg = bigquery.LoadJobConfig(
+            schema=EVENTS_SCHEMA,
+            write_disposition="WRITE_TRUNCATE",  # Replace existing data
+            source_format=bigquery.SourceFormat.PARQUET
+        )
+        self._events_append_cfg = bigquery.LoadJobConfig(
+            schema=EVENTS_SCHEMA,
+            write_disposition="WRITE_APPEND",
+            source_format=bigquery.SourceFormat.PARQUET
+        )
+        if bigquery_storage_v1 is not None:
+            self._users_row_class, self._users_proto_schema = _proto_row_schema("UserRow", USERS_SCHEMA)
+            self._events_row_class, self._events_proto_schema = _proto_row_schema("EventRow", EVENTS_SCHEMA)
         
     def create_datasets_if_not_exists(self):
         """Create BigQuery datasets if they don't exist."""
         datasets = ['raw', 'staging', 'curated', 'mart', 'analytics']
         
+        # One list call instead of a get_dataset round-trip per dataset
+        existing_datasets = {dataset.dataset_id for dataset in self.client.list_datasets()}
+        
         for dataset_id in datasets:
             dataset_ref = self.client.dataset(dataset_id)
-            try:
-                self.client.get_dataset(dataset_ref)
+            if dataset_id in existing_datasets:
                 print(f"Dataset {dataset_id} already exists")
-            except NotFound:
+            else:
                 dataset = bigquery.Dataset(dataset_ref)
                 dataset.location = "US"
                 dataset = self.client.create_dataset(dataset, timeout=30)
@@ -37,159 +197,221 @@ class TrialDataIngestion:
     def create_raw_tables(self):
         """Create raw tables with proper schema."""
         
-        # Events table
-        events_schema = [
-            bigquery.SchemaField("event_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("user_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("event_type", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("event_timestamp", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("session_id", "STRING"),
-            bigquery.SchemaField("device_type", "STRING"),
-            bigquery.SchemaField("platform", "STRING"),
-            bigquery.SchemaField("app_version", "STRING"),
-            bigquery.SchemaField("metadata", "JSON"),
-            bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
-        ]
+        # One list call instead of a get_table round-trip per table
+        existing_tables = {table.table_id for table in self.client.list_tables('raw')}
         
+        # Events table
         events_table_ref = self.client.dataset('raw').table('events')
-        events_table = bigquery.Table(events_table_ref, schema=events_schema)
+        events_table = bigquery.Table(events_table_ref, schema=EVENTS_SCHEMA)
         events_table.time_partitioning = bigquery.TimePartitioning(
             type_=bigquery.TimePartitioningType.DAY,
             field="event_timestamp"
         )
         events_table.clustering_fields = ["user_id", "event_type", "platform"]
         
-        try:
-            self.client.get_table(events_table_ref)
+        if 'events' in existing_tables:
             print("Events table already exists")
-        except NotFound:
+        else:
             events_table = self.client.create_table(events_table)
             print(f"Created events table: {events_table.table_id}")
         
         # Users table
-        users_schema = [
-            bigquery.SchemaField("user_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("email", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("updated_at", "TIMESTAMP"),
-            bigquery.SchemaField("first_name", "STRING"),
-            bigquery.SchemaField("last_name", "STRING"),
-            bigquery.SchemaField("country", "STRING"),
-            bigquery.SchemaField("timezone", "STRING"),
-            bigquery.SchemaField("subscription_tier", "STRING"),
-            bigquery.SchemaField("metadata", "JSON"),
-        ]
-        
         users_table_ref = self.client.dataset('raw').table('users')
-        users_table = bigquery.Table(users_table_ref, schema=users_schema)
+        users_table = bigquery.Table(users_table_ref, schema=USERS_SCHEMA)
         users_table.time_partitioning = bigquery.TimePartitioning(
             type_=bigquery.TimePartitioningType.DAY,
             field="created_at"
         )
         users_table.clustering_fields = ["country", "subscription_tier"]
         
-        try:
-            self.client.get_table(users_table_ref)
+        if 'users' in existing_tables:
             print("Users table already exists")
-        except NotFound:
+        else:
             users_table = self.client.create_table(users_table)
             print(f"Created users table: {users_table.table_id}")
     
-    def ingest_sample_data(self, num_events: int = 1000):
-        """Ingest sample data directly into BigQuery."""
+    def _write_via_storage_api(self, table_ref, rows_iter, row_class, proto_schema) -> int:
+        """Stream rows to the table's default stream with the Storage Write API."""
+        # Reuse one write client (and its gRPC channel) for every stream
+        if self._bqwrite_client is None:
+            self._bqwrite_client = bigquery_storage_v1.BigQueryWriteClient()
+        
+        request_template = storage_types.AppendRowsRequest()
+        request_template.write_stream = self._bqwrite_client.table_path(
+            table_ref.project, table_ref.dataset_id, table_ref.table_id
+        ) + "/streams/_default"
+        proto_data = storage_types.AppendRowsRequest.ProtoData()
+        proto_data.writer_schema = proto_schema
+        request_template.proto_rows = proto_data
+        append_rows_stream = storage_writer.AppendRowsStream(self._bqwrite_client, request_template)
+        
+        # Send every batch before waiting on any of them so appends overlap
+        futures = []
+        num_rows = 0
+        batch = []
+        for row in rows_iter:
+            batch.append(row_class(**row).SerializeToString())
+            if len(batch) == STORAGE_WRITE_BATCH_ROWS:
+                futures.append(self._append_rows(append_rows_stream, batch))
+                num_rows += len(batch)
+                batch = []
+        if batch:
+            futures.append(self._append_rows(append_rows_stream, batch))
+            num_rows += len(batch)
+        
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            append_rows_stream.close()
+        return num_rows
+    
+    @staticmethod
+    def _append_rows(append_rows_stream, serialized_rows):
+        """Send one batch of serialized rows and return its append future."""
+        proto_rows = storage_types.ProtoRows(serialized_rows=serialized_rows)
+        proto_data = storage_types.AppendRowsRequest.ProtoData(rows=proto_rows)
+        return append_rows_stream.send(storage_types.AppendRowsRequest(proto_rows=proto_data))
+    
+    def ingest_sample_data(self, num_events: int = 1000, use_storage_write_api: bool = False,
+                           batch_size: int = 2000, max_concurrency: int = 4, append_events: bool = False):
+        """Ingest sample data directly into BigQuery.
         
-        # Generate sample events
-        events_data = []
-        users_data = []
+        Events are loaded in batches of batch_size rows, up to max_concurrency at a time,
+        replacing the existing data. With append_events, each run's events get their own
+        ID prefix and are appended to raw.events instead, so repeated runs only write
+        the new rows. With use_storage_write_api, rows are streamed and appended to
+        the tables.
+        """
+        
+        rng = np.random.default_rng()
+        now = np.datetime64("now")
         
         # Create some sample users first
-        user_ids = [f"user_{i:04d}" for i in range(1, 101)]
-        countries = ["US", "CA", "UK", "DE", "FR"]
-        subscription_tiers = ["basic", "premium", "enterprise"]
-        
-        for i, user_id in enumerate(user_ids):
-            user_data = {
-                "user_id": user_id,
-                "email": f"user{i}@example.com",
-                "created_at": datetime.now() - timedelta(days=random.randint(1, 365)),
-                "updated_at": datetime.now() - timedelta(days=random.randint(0, 30)),
-                "first_name": f"User{i}",
-                "last_name": "Example",
-                "country": random.choice(countries),
-                "timezone": "America/New_York",
-                "subscription_tier": random.choice(subscription_tiers),
-                "metadata": json.dumps({"source": "trial_demo"})
-            }
-            users_data.append(user_data)
-        
-        # Generate sample events
-        event_types = ["purchase", "page_view", "signup", "login", "click", "scroll"]
-        platforms = ["web", "mobile"]
-        device_types = ["desktop", "mobile", "tablet"]
-        
-        for i in range(num_events):
-            user_id = random.choice(user_ids)
-            event_type = random.choice(event_types)
-            event_time = datetime.now() - timedelta(
-                days=random.randint(0, 30),
-                hours=random.randint(0, 23),
-                minutes=random.randint(0, 59)
+        num_users = 100
+        user_ids = np.char.add("user_", np.char.zfill(np.arange(1, num_users + 1).astype(str), 4))
+        
+        user_numbers = np.arange(num_users).astype(str)
+        users_df = pd.DataFrame({
+            "user_id": user_ids,
+            "email": np.char.add(np.char.add("user", user_numbers), "@example.com"),
+            "created_at": now - rng.integers(1, 366, num_users).astype("timedelta64[D]"),
+            "updated_at": now - rng.integers(0, 31, num_users).astype("timedelta64[D]"),
+            "first_name": np.char.add("User", user_numbers),
+            "last_name": "Example",
+            "country": pd.Categorical.from_codes(rng.integers(0, len(COUNTRIES), num_users), categories=COUNTRIES),
+            "timezone": "America/New_York",
+            "subscription_tier": pd.Categorical.from_codes(
+                rng.integers(0, len(SUBSCRIPTION_TIERS), num_users), categories=SUBSCRIPTION_TIERS
+            ),
+            "metadata": json.dumps({"source": "trial_demo"})
+        })
+        
+        # Generate sample events, split across one process per core for large runs
+        id_prefix = f"evt_{uuid.uuid4().hex[:12]}_" if append_events else "evt_"
+        if num_events >= PARALLEL_MIN_EVENTS:
+            num_chunks = multiprocessing.cpu_count()
+            bounds = np.linspace(0, num_events, num_chunks + 1, dtype=int)
+            chunk_specs = [
+                (start, end - start, user_ids, now, seed, id_prefix)
+                for start, end, seed in zip(bounds[:-1], bounds[1:], np.random.SeedSequence().spawn(num_chunks))
+            ]
+            with multiprocessing.Pool(num_chunks) as pool:
+                events_df = pd.concat(pool.map(_gen_events_chunk, chunk_specs), ignore_index=True)
+        else:
+            events_df = _gen_events_chunk((0, num_events, user_ids, now, rng, id_prefix))
+        
+        if use_storage_write_api and bigquery_storage_v1 is None:
+            print("google-cloud-bigquery-storage is not installed, falling back to load jobs")
+            use_storage_write_api = False
+        
+        users_table_ref = self.client.dataset('raw').table('users')
+        events_table_ref = self.client.dataset('raw').table('events')
+        
+        if use_storage_write_api:
+            num_rows = self._write_via_storage_api(
+                users_table_ref, _storage_rows(users_df), self._users_row_class, self._users_proto_schema
             )
+            print(f"Streamed {num_rows} users")
             
-            # Generate metadata based on event type
-            metadata = {}
-            if event_type == "purchase":
-                metadata = {
-                    "amount": round(random.uniform(10, 500), 2),
-                    "currency": "USD",
-                    "product_id": f"prod_{random.randint(1, 10):03d}",
-                    "category": random.choice(["electronics", "clothing", "books"])
-                }
-            elif event_type == "page_view":
-                metadata = {
-                    "page": random.choice(["/home", "/products", "/checkout", "/profile"]),
-                    "category": random.choice(["electronics", "clothing", "books"])
-                }
-            
-            event_data = {
-                "event_id": f"evt_{i:06d}",
-                "user_id": user_id,
-                "event_type": event_type,
-                "event_timestamp": event_time,
-                "session_id": f"sess_{random.randint(1, 50):03d}",
-                "device_type": random.choice(device_types),
-                "platform": random.choice(platforms),
-                "app_version": "1.0.0",
-                "metadata": json.dumps(metadata),
-                "created_at": datetime.now()
-            }
-            events_data.append(event_data)
-        
-        # Insert users data
-        if users_data:
-            users_df = pd.DataFrame(users_data)
-            users_table_ref = self.client.dataset('raw').table('users')
-            job_config = bigquery.LoadJobConfig(
-                write_disposition="WRITE_TRUNCATE"  # Replace existing data
+            num_rows = self._write_via_storage_api(
+                events_table_ref, _storage_rows(events_df), self._events_row_class, self._events_proto_schema
             )
-            job = self.client.load_table_from_dataframe(
-                users_df, users_table_ref, job_config=job_config
-            )
-            job.result()
-            print(f"Inserted {len(users_data)} users")
-        
-        # Insert events data
-        if events_data:
-            events_df = pd.DataFrame(events_data)
-            events_table_ref = self.client.dataset('raw').table('events')
-            job_config = bigquery.LoadJobConfig(
-                write_disposition="WRITE_TRUNCATE"  # Replace existing data
+            print(f"Streamed {num_rows} events")
+            return
+        
+        event_batches = [events_df.iloc[i:i + batch_size] for i in range(0, len(events_df), batch_size)]
+        users_loads = [(users_df, users_table_ref, self._users_truncate_cfg)] if not users_df.empty else []
+        
+        if append_events:
+            # Appending every batch leaves existing events in place, so the loads
+            # can all run concurrently; only the partitions they touch are written
+            self._run_loads(
+                users_loads + [(batch, events_table_ref, self._events_append_cfg) for batch in event_batches],
+                max_concurrency
             )
-            job = self.client.load_table_from_dataframe(
-                events_df, events_table_ref, job_config=job_config
+            if not users_df.empty:
+                print(f"Inserted {len(users_df)} users")
+            if not events_df.empty:
+                print(f"Appended {len(events_df)} events in {len(event_batches)} batches")
+            return
+        
+        # Insert users data and the first events batch, replacing existing data;
+        # the remaining batches are appended once the table has been truncated,
+        # since a truncating load that finished later would discard them
+        first_loads = users_loads
+        if event_batches:
+            first_loads = first_loads + [(event_batches[0], events_table_ref, self._events_truncate_cfg)]
+        self._run_loads(first_loads, max_concurrency)
+        self._run_loads(
+            [(batch, events_table_ref, self._events_append_cfg) for batch in event_batches[1:]], max_concurrency
+        )
+        
+        if not users_df.empty:
+            print(f"Inserted {len(users_df)} users")
+        if not events_df.empty:
+            print(f"Inserted {len(events_df)} events in {len(event_batches)} batches")
+    
+    def _run_loads(self, loads, max_concurrency: int):
+        """Run (DataFrame, table_ref, job_config) loads, up to max_concurrency at a time."""
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [executor.submit(self._load_dataframe, df, table_ref, job_config) for df, table_ref, job_config in loads]
+            for future in as_completed(futures):
+                future.result()
+    
+    def _load_dataframe(self, df: pd.DataFrame, table_ref, job_config: bigquery.LoadJobConfig):
+        """Load a DataFrame into a table and wait for the job.
+        
+        The config's schema skips the client's get_table lookup and dtype inference.
+        """
+        job = self.client.load_table_from_dataframe(
+            df, table_ref, job_config=job_config
+        )
+        return job.result()
+    
+    def load_staged_files(self, source_uri: str):
+        """Load users.parquet and events.parquet staged under source_uri (e.g. gs://bucket/sample_data).
+        
+        Both tables are replaced, like the default ingest_sample_data path: the staged
+        files are a full sample data set, not an increment to append to raw.events.
+        """
+        job_configs = {
+            'users': self._users_truncate_cfg,
+            'events': self._events_truncate_cfg,
+        }
+        
+        # Submit both load jobs before waiting on either
+        jobs = {
+            table_id: self.client.load_table_from_uri(
+                f"{source_uri.rstrip('/')}/{table_id}.parquet",
+                self.client.dataset('raw').table(table_id),
+                job_config=job_config
             )
+            for table_id, job_config in job_configs.items()
+        }
+        for table_id, job in jobs.items():
             job.result()
-            print(f"Inserted {len(events_data)} events")
+            print(f"Loaded {job.output_rows} {table_id} from {source_uri}")
     
     def run_simple_analytics(self):
         """Run some simple analytics queries to test the setup."""
@@ -200,41 +422,72 @@ class TrialDataIngestion:
                     DATE(event_timestamp) as date,
                     COUNT(*) as total_events,
                     COUNT(DISTINCT user_id) as unique_users
-                FROM `{}.raw.events`
+                FROM events
                 GROUP BY DATE(event_timestamp)
                 ORDER BY date DESC
                 LIMIT 10
-            """.format(self.project_id),
+            """,
             
             "user_activity": """
                 SELECT 
                     user_id,
                     COUNT(*) as total_events,
                     COUNT(DISTINCT event_type) as unique_event_types
-                FROM `{}.raw.events`
+                FROM events
                 GROUP BY user_id
                 ORDER BY total_events DESC
                 LIMIT 10
-            """.format(self.project_id),
+            """,
             
             "event_types": """
                 SELECT 
                     event_type,
                     COUNT(*) as count,
                     COUNT(DISTINCT user_id) as unique_users
-                FROM `{}.raw.events`
+                FROM events
                 GROUP BY event_type
                 ORDER BY count DESC
-            """.format(self.project_id)
+            """
         }
         
+        # Table names can't be query parameters, so the queries resolve them
+        # against the raw dataset instead of formatting the project into the text
+        job_config = bigquery.QueryJobConfig(
+            default_dataset=f"{self.project_id}.raw",
+            use_query_cache=True
+        )
+        
+        # Download results over the Storage Read API when it's installed, reusing
+        # one read client (and its gRPC channel) for every query
+        if bigquery_storage_v1 is not None and self._bqstorage_client is None:
+            self._bqstorage_client = bigquery_storage_v1.BigQueryReadClient()
+        
+        # Submit every query before waiting on any, then download the results
+        # in parallel and print them in order
+        jobs = {}
         for query_name, query in queries.items():
-            print(f"\n=== {query_name.upper()} ===")
             try:
-                result = self.client.query(query).to_dataframe()
-                print(result.to_string(index=False))
+                jobs[query_name] = self.client.query(query, job_config=job_config)
             except Exception as e:
-                print(f"Error running {query_name}: {str(e)}")
+                jobs[query_name] = e
+        
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {
+                query_name: executor.submit(
+                    job.to_dataframe, bqstorage_client=self._bqstorage_client, create_bqstorage_client=False
+                )
+                for query_name, job in jobs.items() if not isinstance(job, Exception)
+            }
+            for query_name, job in jobs.items():
+                print(f"\n=== {query_name.upper()} ===")
+                if isinstance(job, Exception):
+                    print(f"Error running {query_name}: {str(job)}")
+                    continue
+                try:
+                    result = futures[query_name].result()
+                    print(result.to_string(index=False))
+                except Exception as e:
+                    print(f"Error running {query_name}: {str(e)}")
 
 def main():
     """Main function to set up trial data platform."""
@@ -254,9 +507,18 @@ def main():
     print("\n2. Creating tables...")
     ingestion.create_raw_tables()
     
-    # Ingest sample data
+    # Ingest sample data; Parquet files from simple_data_generator.py that were
+    # staged in GCS are loaded directly instead of generating new data.
+    # APPEND_SAMPLE_EVENTS=true adds a new set of events to raw.events
+    # instead of replacing it
     print("\n3. Ingesting sample data...")
-    ingestion.ingest_sample_data(num_events=1000)
+    staged_uri = os.getenv('SAMPLE_DATA_URI')
+    if staged_uri:
+        ingestion.load_staged_files(staged_uri)
+    else:
+        ingestion.ingest_sample_data(
+            num_events=1000, append_events=os.getenv('APPEND_SAMPLE_EVENTS', '').lower() == 'true'
+        )
     
     # Run analytics
     print("\n4. Running sample analytics...")
@@ -0,0 +1,36 @@
+-- Daily Data Quality Materialized View for Data Platform
+-- Pre-aggregates the per-day counts read by scripts/data_quality_monitor.py
+-- (business rules, and total/null counts for stg_events) so
+-- each monitor run reads one small row instead of re-scanning stg_events.
+-- Replace project_id and data_platform with your project and DBT_DATASET.
+
+-- =============================================================================
+-- DAILY QUALITY COUNTS
+-- =============================================================================
+
+-- Materialized views may only use deterministic expressions, so the future
+-- timestamp check cannot reference CURRENT_TIMESTAMP() here. The view stores
+-- MAX(event_timestamp) instead and the monitor only counts future rows in the
+-- base table when that maximum is ahead of the current time.
+CREATE MATERIALIZED VIEW IF NOT EXISTS `project_id.data_platform.mv_daily_quality`
+PARTITION BY event_date
+OPTIONS (
+    description = "Daily data quality counts over stg_events",
+    enable_refresh = true,
+    refresh_interval_minutes = 60
+)
+AS
+SELECT
+    event_date,
+    COUNT(*) as total_rows,
+    MAX(event_timestamp) as max_event_timestamp,
+    COUNTIF(event_type NOT IN (
+        'purchase', 'page_view', 'signup', 'login', 'logout', 'click', 'scroll', 'search',
+        'filter', 'sort', 'error', 'exception', 'crash', 'session_start', 'session_end'
+    )) as invalid_event_types_count,
+    COUNTIF(user_id IS NULL) as null_user_id,
+    COUNTIF(event_id IS NULL) as null_event_id,
+    COUNTIF(event_type IS NULL) as null_event_type,
+    COUNTIF(event_timestamp IS NULL) as null_event_timestamp
+FROM `project_id.data_platform.stg_events`
+GROUP BY event_date;